@@ -1,59 +1,234 @@
 import os
+import sys
+import argparse
+import json
+import functools
+import mmap
+import struct
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-import zipfile
 
 # Define patterns for metadata files to be excluded from core content comparison
 # These are files/directories often specific to the build tool or environment
 # and whose absence in the migrated build (Gradle) is often expected or desired.
 IGNORED_METADATA_PATTERNS = {
-    "prefixes": ["META-INF/maven/"],  # Ignore everything under META-INF/maven/
-    "exact_files": ["META-INF/jpms.args"]  # Ignore this specific file
+    "prefixes": ("META-INF/maven/",),  # Ignore everything under META-INF/maven/
+    "exact_files": frozenset({"META-INF/jpms.args"})  # Ignore this specific file
 }
+# The same patterns as UTF-8 bytes, for matching raw archive entry names
+IGNORED_METADATA_PREFIXES_BYTES = tuple(p.encode('utf-8') for p in IGNORED_METADATA_PATTERNS["prefixes"])
+IGNORED_METADATA_EXACT_BYTES = frozenset(p.encode('utf-8') for p in IGNORED_METADATA_PATTERNS["exact_files"])
+
+# Directory names never descended into when searching for project roots (hidden directories are skipped as well)
+PRUNE_DIRS = frozenset({'.git', '.svn', '.hg', '.gradle', '.mvn', 'node_modules', 'target', 'build', 'bin', '__pycache__',
+                        '.venv', 'venv', 'dist', 'out', '.idea', '.vscode'})
+
+# Files at least this large are hashed through mmap rather than buffered reads
+MMAP_HASH_THRESHOLD = 10 << 20
+
+# Build files that mark a directory as a Maven or Gradle module; most entries miss this set in one lookup
+PROJECT_MARKER_FILES = frozenset({'pom.xml', 'build.gradle', 'build.gradle.kts'})
+
+# Scans with more projects than this are spread over a process pool; smaller ones aren't worth its start-up
+PARALLEL_PROJECT_THRESHOLD = 4
+
+# Class trees are walked through directory descriptors (openat) where the platform allows it
+FD_RELATIVE_WALK = os.open in os.supports_dir_fd and os.scandir in os.supports_fd
+DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+
+# Language dirs under Gradle's build/classes whose main/ output is compared, in lookup order
+GRADLE_CLASS_LANGUAGES = ('java', 'kotlin', 'scala', 'groovy')
+
+# Status sets consulted by determine_overall_status
+ARTIFACT_FAILURE_STATUSES = frozenset({"Core Content Mismatch", "Structure Mismatch (Names)", "Maven Only", "Gradle Only"})
+# Classes/test-report statuses that don't count as a difference
+NON_FAILING_COMPARISON_STATUSES = frozenset({"Match", "Match (Artifacts Identical)", "N/A", "Not Built", "None Found (Both)"})
+
+# Archive comparisons are memoized across runs, keyed on path/size/mtime of both archives
+# (--hash-check digests share the file under their own ["digest", ...] keys). main() keeps one file per scanned
+# root in the user's cache dir and rewrites it with only the entries that run could use, so stale keys drop out.
+# Bump the version whenever the shape of the compare_archive_contents result changes.
+ARCHIVE_CACHE_DIR_NAME = 'migration_check'
+ARCHIVE_CACHE_VERSION = 2
+DIGEST_CACHE_KEY_PREFIX = '["digest",'
+
+# ZIP structures read by fast_zip_names: the end-of-central-directory record (entry count, directory
+# size/offset) and the fixed 46-byte central directory file header (signature, flags, name/extra/comment lengths).
+ZIP_EOCD_RECORD = struct.Struct('<I6xHII2x')
+ZIP_CENTRAL_DIR_HEADER = struct.Struct('<I4xH18xHHH12x')
+ZIP_CENTRAL_DIR_SIGNATURE = 0x02014b50
+
+def is_ignored_metadata(name):
+    """Checks if a raw (UTF-8 bytes) archive entry name matches any of the defined metadata patterns."""
+    # One startswith over the whole prefix tuple, then a set lookup; both built from IGNORED_METADATA_PATTERNS
+    return name.startswith(IGNORED_METADATA_PREFIXES_BYTES) or name in IGNORED_METADATA_EXACT_BYTES
+
+def iter_class_files(root):
+    """Yields paths of all .class files under root using an explicit scandir stack."""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        with os.scandir(d) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False): stack.append(e.path)
+                elif e.name.endswith('.class'): yield e.path
+
+def _collect_class_files_at(dir_fd, prefix, into):
+    """collect_class_files body for dir_fd platforms: each subdirectory is opened relative to its parent's
+    descriptor, so deep package trees aren't resolved from the root again at every level."""
+    with os.scandir(dir_fd) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                fd = os.open(e.name, DIR_OPEN_FLAGS, dir_fd=dir_fd)
+                try: _collect_class_files_at(fd, prefix + e.name + os.sep, into)
+                finally: os.close(fd)
+            elif e.name.endswith('.class'): into.add(sys.intern(prefix + e.name))
+
+def collect_class_files(root, into=None):
+    """Returns the set of .class paths under root (a str), relative to root, adding them to into if given.
+
+    Paths are interned so the Maven and Gradle sets share string objects and set comparisons hit the identity fast path."""
+    if into is None: into = set()
+    if FD_RELATIVE_WALK:
+        fd = os.open(root, DIR_OPEN_FLAGS)
+        try: _collect_class_files_at(fd, '', into)
+        finally: os.close(fd)
+    else:
+        prefix_len = len(os.path.join(root, ''))
+        into.update(sys.intern(p[prefix_len:]) for p in iter_class_files(root))
+    return into
 
-def is_ignored_metadata(file_path, patterns=IGNORED_METADATA_PATTERNS):
-    """Checks if a file path matches any of the defined metadata patterns."""
-    for prefix in patterns.get("prefixes", []):
-        if file_path.startswith(prefix):
-            return True
-    if file_path in patterns.get("exact_files", []):
-        return True
-    return False
-
-def find_project_roots(search_path):
-    """Finds project roots containing BOTH pom.xml and build.gradle[.kts]."""
-    project_roots_to_analyze = []
-    abs_search_path = Path(search_path).resolve()
-    handled_paths = set()
+def list_dir_names(path):
+    """Returns the set of entry names in path, or None if it is not a readable directory."""
+    try:
+        return set(os.listdir(path))
+    except OSError:
+        return None
 
-    for root, dirs, files in os.walk(abs_search_path, topdown=True):
-        current_path = Path(root).resolve()
-        if current_path in handled_paths:
-            dirs[:] = []
-            continue
+def list_artifacts(directory):
+    """Returns {name: DirEntry} for the .jar/.war files directly inside directory, ordered by name, from a single listing.
 
-        dirs[:] = [d for d in dirs if d not in ['.git', '.svn', '.hg', 'node_modules', 'target', 'build', '__pycache__', '.venv', 'venv', 'dist', 'out', '.idea', '.vscode']]
+    The entries are passed on as archive paths, so their cached stat results are reused."""
+    try:
+        with os.scandir(directory) as it:
+            return dict(sorted((e.name, e) for e in it if e.name.endswith(('.jar', '.war')) and e.is_file()))
+    except OSError:
+        return {}
+
+def stat_path(path):
+    """os.stat, served from the DirEntry's own cache when path is one."""
+    return path.stat() if isinstance(path, os.DirEntry) else os.stat(path)
 
-        has_pom = 'pom.xml' in files
-        has_gradle = 'build.gradle.kts' in files or 'build.gradle' in files
+def count_test_reports(reports_dir):
+    """Counts TEST-*.xml report files in a single directory listing; None if the directory can't be listed."""
+    try:
+        with os.scandir(reports_dir) as it:
+            return sum(1 for e in it if e.name.startswith('TEST-') and e.name.endswith('.xml'))
+    except OSError:
+        return None
+
+def find_project_roots(search_path, descend_into_matches=True):
+    """Finds project roots containing BOTH pom.xml and build.gradle[.kts].
+
+    With descend_into_matches=False the walk stops at the first qualifying directory on each
+    branch, skipping nested modules of a multi-module build."""
+    project_roots_to_analyze = []
+    project_root_paths = set()
+    abs_search_path = str(Path(search_path).resolve())
+
+    # Pre-order walk with an explicit stack; the build markers are recorded as booleans while
+    # listing each directory, so no per-directory file list is built. Symlinked directories are
+    # never followed, so no directory is visited twice and paths below the resolved root stay resolved.
+    # Paths stay plain strings; a Path is only built for the project records that are returned.
+    stack = [abs_search_path]
+    while stack:
+        root = stack.pop()
+
+        has_pom = has_gradle = False
+        subdirs, src_dir = [], None
+        try:
+            with os.scandir(root) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name == 'src': src_dir = e.path
+                        elif e.name not in PRUNE_DIRS and not e.name.startswith('.'): subdirs.append(e.path)
+                    elif e.name in PROJECT_MARKER_FILES:
+                        if e.name == 'pom.xml': has_pom = True
+                        else: has_gradle = True
+        except OSError:
+            continue
 
         if has_pom and has_gradle:
-            if not any(p['path'] == current_path for p in project_roots_to_analyze):
-                project_roots_to_analyze.append({'path': current_path, 'name': current_path.name})
-            handled_paths.add(current_path)
+            project_roots_to_analyze.append({'path': Path(root), 'name': os.path.basename(root)})
+            project_root_paths.add(root)
+            if not descend_into_matches: continue
         elif (has_pom or has_gradle):
+            parent = os.path.dirname(root)
             is_root_or_direct_relevant_child = (
-                current_path == abs_search_path or
-                current_path.parent == abs_search_path or
-                any(current_path.parent == p['path'] for p in project_roots_to_analyze if p['path'] != current_path)
+                root == abs_search_path or
+                parent == abs_search_path or
+                parent in project_root_paths
             )
             if is_root_or_direct_relevant_child:
-                 print(f"Skipping: {current_path.name} (at {current_path}) - requires both pom.xml and build.gradle[.kts].")
-            handled_paths.add(current_path)
+                 print(f"Skipping: {os.path.basename(root)} (at {root}) - requires both pom.xml and build.gradle[.kts].")
+
+        # A module with both build files keeps its sub-modules beside src/, never inside it,
+        # so the (often very deep) source tree is only walked for directories that aren't projects.
+        if src_dir is not None and not (has_pom and has_gradle): subdirs.append(src_dir)
+        stack.extend(reversed(subdirs))
     return project_roots_to_analyze
 
+def fast_zip_names(archive_path):
+    """Lists entry names as UTF-8 bytes by walking the central directory directly, without building ZipInfo objects.
+
+    Names are left undecoded; only non-ASCII CP437 names are transcoded so both archives agree on encoding.
+    Falls back to zipfile for anything it doesn't handle (ZIP64, damaged or empty archives)."""
+    try:
+        with open(archive_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # The EOCD record is the last 22 bytes, followed by an archive comment of at most 64KB
+            eocd = mm.rfind(b'PK\x05\x06', max(0, len(mm) - 22 - 0xFFFF))
+            if eocd < 0: raise ValueError("end of central directory not found")
+            _, total_entries, cd_size, cd_offset = ZIP_EOCD_RECORD.unpack_from(mm, eocd)
+            if total_entries == 0xFFFF or cd_offset == 0xFFFFFFFF: raise ValueError("ZIP64 archive")
+            pos = eocd - cd_size  # Locate the central directory from its end, so prepended data is tolerated
+            if pos < 0: raise ValueError("central directory out of bounds")
+            names = []
+            unpack_header, header_size = ZIP_CENTRAL_DIR_HEADER.unpack_from, ZIP_CENTRAL_DIR_HEADER.size
+            for _ in range(total_entries):
+                signature, flags, name_len, extra_len, comment_len = unpack_header(mm, pos)
+                if signature != ZIP_CENTRAL_DIR_SIGNATURE: raise ValueError("bad central directory entry")
+                pos += header_size
+                name = mm[pos:pos + name_len]
+                if not flags & 0x800 and not name.isascii(): name = name.decode('cp437').encode('utf-8')
+                names.append(name)
+                pos += name_len + extra_len + comment_len
+            return names
+    except (OSError, ValueError, struct.error):
+        import zipfile
+        with zipfile.ZipFile(archive_path, 'r') as zf:
+            return [name.encode('utf-8') for name in zf.namelist()]
+
+def read_archive_names(archive_path):
+    """Returns (core_files, ignored_metadata_files) for the non-directory entries of an archive.
+
+    Both are frozensets; core names stay UTF-8 bytes (metadata names are few and decoded)."""
+    core_files, metadata_files = set(), set()
+    for name in fast_zip_names(archive_path):
+        if name.endswith(b'/'): continue
+        if is_ignored_metadata(name): metadata_files.add(name.decode('utf-8', 'replace'))
+        else: core_files.add(name)
+    return frozenset(core_files), frozenset(metadata_files)
+
+def decode_names(names):
+    """Decodes raw archive entry names for display."""
+    return {name.decode('utf-8', 'replace') for name in names}
+
 def compare_archive_contents(maven_archive_path, gradle_archive_path):
-    """Compares internal files of two archives, distinguishing core vs. defined metadata."""
+    """Compares internal files of two archives, distinguishing core vs. defined metadata.
+
+    Core names are compared as raw bytes; only the entries unique to one side are decoded."""
+    import zipfile  # Imported lazily (like datetime) to keep CLI startup quick
     comparison = {
         "core_match": False,
         "maven_only_core_files": set(), "gradle_only_core_files": set(),
@@ -62,39 +237,135 @@ def compare_archive_contents(maven_archive_path, gradle_archive_path):
         "error": None,
         "maven_core_files_count": 0, "gradle_core_files_count": 0,
         "maven_ignored_metadata_count": 0, "gradle_ignored_metadata_count": 0,
-        "maven_core_files": set(), "gradle_core_files": set() # Ensure these are initialized
     }
     try:
-        with zipfile.ZipFile(maven_archive_path, 'r') as maven_zip, \
-             zipfile.ZipFile(gradle_archive_path, 'r') as gradle_zip:
-
-            maven_all_files = set(info.filename for info in maven_zip.infolist() if not info.is_dir())
-            gradle_all_files = set(info.filename for info in gradle_zip.infolist() if not info.is_dir())
-
-            comparison["maven_core_files"] = {f for f in maven_all_files if not is_ignored_metadata(f)}
-            comparison["gradle_core_files"] = {f for f in gradle_all_files if not is_ignored_metadata(f)}
-
-            comparison["maven_ignored_metadata_files"] = {f for f in maven_all_files if is_ignored_metadata(f)}
-            comparison["gradle_ignored_metadata_files"] = {f for f in gradle_all_files if is_ignored_metadata(f)}
-
-            comparison["maven_core_files_count"] = len(comparison["maven_core_files"])
-            comparison["gradle_core_files_count"] = len(comparison["gradle_core_files"])
-            comparison["maven_ignored_metadata_count"] = len(comparison["maven_ignored_metadata_files"])
-            comparison["gradle_ignored_metadata_count"] = len(comparison["gradle_ignored_metadata_files"])
-
-            if comparison["maven_core_files"] == comparison["gradle_core_files"]:
-                comparison["core_match"] = True
-            else:
-                comparison["core_match"] = False
-                comparison["maven_only_core_files"] = comparison["maven_core_files"] - comparison["gradle_core_files"]
-                comparison["gradle_only_core_files"] = comparison["gradle_core_files"] - comparison["maven_core_files"]
+        # Both central directories are read concurrently so their seeks/reads overlap on slow storage.
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            maven_future = ex.submit(read_archive_names, maven_archive_path)
+            gradle_future = ex.submit(read_archive_names, gradle_archive_path)
+            maven_core_files, comparison["maven_ignored_metadata_files"] = maven_future.result()
+            gradle_core_files, comparison["gradle_ignored_metadata_files"] = gradle_future.result()
+
+        comparison["maven_core_files_count"] = len(maven_core_files)
+        comparison["gradle_core_files_count"] = len(gradle_core_files)
+        comparison["maven_ignored_metadata_count"] = len(comparison["maven_ignored_metadata_files"])
+        comparison["gradle_ignored_metadata_count"] = len(comparison["gradle_ignored_metadata_files"])
+
+        # Differing counts prove a mismatch without probing any element; set == stops at the first missing name
+        if comparison["maven_core_files_count"] == comparison["gradle_core_files_count"] and maven_core_files == gradle_core_files:
+            comparison["core_match"] = True
+        elif not maven_core_files or not gradle_core_files:
+            # One side has no core content at all: the differences are just the two sets themselves
+            comparison["maven_only_core_files"] = decode_names(maven_core_files)
+            comparison["gradle_only_core_files"] = decode_names(gradle_core_files)
+        else:
+            comparison["core_match"] = False
+            comparison["maven_only_core_files"] = decode_names(maven_core_files - gradle_core_files)
+            comparison["gradle_only_core_files"] = decode_names(gradle_core_files - maven_core_files)
 
     except FileNotFoundError as e:
         comparison["error"] = f"Archive not found: {e.filename}"
     except zipfile.BadZipFile:
-        comparison["error"] = f"Corrupt archive detected (Maven: {maven_archive_path.name}, Gradle: {gradle_archive_path.name}). Check files manually."
+        comparison["error"] = f"Corrupt archive detected (Maven: {os.path.basename(maven_archive_path)}, Gradle: {os.path.basename(gradle_archive_path)}). Check files manually."
     except Exception as e:
-        comparison["error"] = f"Error comparing archives ({maven_archive_path.name} vs {gradle_archive_path.name}): {str(e)}"
+        comparison["error"] = f"Error comparing archives ({os.path.basename(maven_archive_path)} vs {os.path.basename(gradle_archive_path)}): {str(e)}"
+    return comparison
+
+@functools.lru_cache(maxsize=None)
+def content_hasher():
+    """Constructor for the hash used by --hash-check. Only equality matters, so BLAKE3 is preferred when the
+    optional blake3 package is installed (SIMD, multithreaded); otherwise SHA-256 from hashlib."""
+    try:
+        import blake3
+    except ImportError:
+        import hashlib
+        # Not a security use: lets FIPS-mode OpenSSL builds serve the accelerated (SHA-NI/ARMv8) SHA-256 directly
+        return functools.partial(hashlib.sha256, usedforsecurity=False) if sys.version_info >= (3, 9) else hashlib.sha256
+    return functools.partial(blake3.blake3, max_threads=blake3.blake3.AUTO)
+
+def file_content_hash(path):
+    """Hex content_hasher digest of a file: mapped whole when large, otherwise streamed (hashlib.file_digest on Python 3.11+)."""
+    import hashlib
+    new_hasher = content_hasher()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_HASH_THRESHOLD:
+            # Hashing straight from the page cache skips the copy into a read buffer
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'): mm.madvise(mmap.MADV_SEQUENTIAL)
+                digest = new_hasher()
+                digest.update(mm)
+                return digest.hexdigest()
+        if hasattr(hashlib, 'file_digest'): return hashlib.file_digest(f, new_hasher).hexdigest()
+        # Older Pythons: one reused 1 MiB buffer, so no block is allocated per read
+        digest, buf = new_hasher(), bytearray(1 << 20)
+        view = memoryview(buf)
+        while n := f.readinto(buf): digest.update(view[:n])
+        return digest.hexdigest()
+
+def cached_file_content_hash(path, cache):
+    """file_content_hash, memoized in the archive cache on (algorithm, path, size, mtime_ns).
+    Hits are written back too, so a per-run overlay (see _analyze_project) records every key that was used."""
+    st = stat_path(path)
+    key = json.dumps(["digest", content_hasher()().name, os.fspath(path), st.st_size, st.st_mtime_ns])
+    digest = cache.get(key)
+    cache[key] = digest = file_content_hash(path) if digest is None else digest
+    return digest
+
+def archives_identical(maven_archive_path, gradle_archive_path, cache=None):
+    """True if both archives are byte-identical; sizes are compared before anything is hashed.
+    With cache, digests of unchanged archives are reused from earlier runs."""
+    content_hash = file_content_hash if cache is None else functools.partial(cached_file_content_hash, cache=cache)
+    try:
+        size = stat_path(maven_archive_path).st_size
+        if size != stat_path(gradle_archive_path).st_size: return False
+        if size < 1 << 20: return content_hash(maven_archive_path) == content_hash(gradle_archive_path)
+        # hashlib releases the GIL while digesting, so two larger archives hash in parallel
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            maven_digest = ex.submit(content_hash, maven_archive_path)
+            return content_hash(gradle_archive_path) == maven_digest.result()
+    except OSError:
+        return False
+
+def archive_cache_file(search_root):
+    """Cache file for one scanned root under $XDG_CACHE_HOME (default ~/.cache), so nothing is written into the tree."""
+    import hashlib
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    root_key = hashlib.sha256(os.fsencode(search_root)).hexdigest()[:16]
+    return os.path.join(cache_home, ARCHIVE_CACHE_DIR_NAME, f'archive_comparisons-{root_key}.json')
+
+def load_archive_cache(cache_file):
+    """Loads memoized archive comparisons, discarding the cache if it is unreadable or from another version."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != ARCHIVE_CACHE_VERSION: return {}
+    return data.get("entries", {})
+
+def save_archive_cache(cache, cache_file):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": ARCHIVE_CACHE_VERSION, "entries": cache}, f)
+    except OSError as e: print(f"Warning: could not write archive cache '{cache_file}': {e}")
+
+def compare_archive_contents_cached(maven_archive_path, gradle_archive_path, cache):
+    """compare_archive_contents, memoized in cache on (path, size, mtime_ns) of both archives.
+    Like cached_file_content_hash, hits are written back so the keys used by a run can be collected."""
+    try:
+        m_stat, g_stat = stat_path(maven_archive_path), stat_path(gradle_archive_path)
+    except OSError:
+        return compare_archive_contents(maven_archive_path, gradle_archive_path)
+    key = json.dumps([os.fspath(maven_archive_path), m_stat.st_size, m_stat.st_mtime_ns,
+                      os.fspath(gradle_archive_path), g_stat.st_size, g_stat.st_mtime_ns])
+    cached = cache.get(key)
+    if cached is not None:
+        cache[key] = cached
+        return {k: set(v) if isinstance(v, list) else v for k, v in cached.items()}
+    comparison = compare_archive_contents(maven_archive_path, gradle_archive_path)
+    if not comparison["error"]:
+        cache[key] = {k: sorted(v) if isinstance(v, (set, frozenset)) else v for k, v in comparison.items()}
     return comparison
 
 def determine_overall_status(results):
@@ -105,20 +376,12 @@ def determine_overall_status(results):
     if not maven_target_exists: return "Maven Output Missing"
     if not gradle_build_exists: return "Gradle Output Missing"
 
-    is_ok_core = True
-    if results["artifact_comparison_status"] != "Match (Core Content)":
-        if results["artifact_comparison_status"] in ["Core Content Mismatch", "Structure Mismatch (Names)",
-                                                   "Maven Only", "Gradle Only"] or \
-           results["artifact_comparison_status"].startswith("Error Comparing Content"):
-            is_ok_core = False
-
-    if results["classes_comparison_status"] != "Match":
-        if results["classes_comparison_status"] not in ["N/A", "Not Built", "None Found (Both)"]:
-            is_ok_core = False
-
-    if results["test_reports_status"] != "Match":
-        if results["test_reports_status"] not in ["N/A", "Not Built", "None Found (Both)"]:
-            is_ok_core = False
+    artifact_status = results["artifact_comparison_status"]
+    is_ok_core = (
+        artifact_status not in ARTIFACT_FAILURE_STATUSES and not artifact_status.startswith("Error Comparing Content") and
+        results["classes_comparison_status"] in NON_FAILING_COMPARISON_STATUSES and
+        results["test_reports_status"] in NON_FAILING_COMPARISON_STATUSES
+    )
 
     if is_ok_core:
         gradle_has_unexpected_ignored_metadata = any(
@@ -136,7 +399,8 @@ def determine_overall_status(results):
 
     return "Differences Found"
 
-def compare_outputs(project_path, maven_target_dir, gradle_build_dir):
+def compare_outputs(project_path, maven_target_dir, gradle_build_dir, archive_cache=None, hash_check=False):
+    """Compares one project's Maven and Gradle outputs. With hash_check, byte-identical artifacts stand in for the classes comparison."""
     results = {
         "project_path": str(project_path.name),
         "full_project_path": str(project_path),
@@ -147,95 +411,123 @@ def compare_outputs(project_path, maven_target_dir, gradle_build_dir):
         "overall_notes": [], "overall_status": "Pending"
     }
 
-    results["maven_target_exists"] = "Yes" if maven_target_dir.exists() else "No"
-    results["gradle_build_exists"] = "Yes" if gradle_build_dir.exists() else "No"
-
-    if results["maven_target_exists"] == "No" and results["gradle_build_exists"] == "No":
+    # Plain strings for everything below the output dirs
+    maven_target_str, gradle_build_str = os.fspath(maven_target_dir), os.fspath(gradle_build_dir)
+    # One listing per output dir; child existence checks below are set lookups instead of stat calls,
+    # and the two existence flags are computed once and reused by every section.
+    maven_target_children = list_dir_names(maven_target_str)
+    gradle_build_children = list_dir_names(gradle_build_str)
+    maven_target_exists, gradle_build_exists = maven_target_children is not None, gradle_build_children is not None
+    results["maven_target_exists"] = "Yes" if maven_target_exists else "No"
+    results["gradle_build_exists"] = "Yes" if gradle_build_exists else "No"
+    maven_target_children, gradle_build_children = maven_target_children or set(), gradle_build_children or set()
+
+    if not maven_target_exists and not gradle_build_exists:
         for key in ["artifact_comparison_status", "classes_comparison_status", "test_reports_status"]: results[key] = "Not Built"
         results["overall_status"] = determine_overall_status(results); return results
 
-    if maven_target_dir.exists() or gradle_build_dir.exists():
-        maven_artifacts_paths = sorted(list(maven_target_dir.glob('*.jar')) + list(maven_target_dir.glob('*.war')), key=lambda p: p.name) if maven_target_dir.exists() else []
-        gradle_libs_dir = gradle_build_dir / 'libs'
-        gradle_artifacts_paths = sorted(list(gradle_libs_dir.glob('*.jar')) + list(gradle_libs_dir.glob('*.war')), key=lambda p: p.name) if gradle_libs_dir.exists() else []
-
-        maven_artifact_names = [p.name for p in maven_artifacts_paths]
-        gradle_artifact_names = [p.name for p in gradle_artifacts_paths]
-        results["artifact_details"] = f"Maven artifacts: {maven_artifact_names or 'None'}. Gradle artifacts: {gradle_artifact_names or 'None'}."
-
-        if not maven_artifacts_paths and not gradle_artifacts_paths: results["artifact_comparison_status"] = "None Found (Both)"
-        elif not maven_artifacts_paths and gradle_artifacts_paths : results["artifact_comparison_status"] = "Gradle Only"
-        elif maven_artifacts_paths and not gradle_artifacts_paths: results["artifact_comparison_status"] = "Maven Only"
-        elif maven_artifact_names == gradle_artifact_names:
-            results["artifact_comparison_status"] = "Match (Names)"
-            all_archives_core_content_matched = True
-            any_gradle_produced_ignored_metadata = False
-
-            for m_path, g_path in zip(maven_artifacts_paths, gradle_artifacts_paths):
-                content_comp = compare_archive_contents(m_path, g_path)
-                content_comp_summary = {
-                    "archive_name": m_path.name, "content_core_match": content_comp["core_match"],
-                    "error": content_comp["error"],
-                    "maven_core_files_count": content_comp["maven_core_files_count"],
-                    "gradle_core_files_count": content_comp["gradle_core_files_count"],
-                    "maven_only_core_files": sorted(list(content_comp["maven_only_core_files"])),
-                    "gradle_only_core_files": sorted(list(content_comp["gradle_only_core_files"])),
-                    "maven_ignored_metadata_count": content_comp["maven_ignored_metadata_count"],
-                    "gradle_ignored_metadata_count": content_comp["gradle_ignored_metadata_count"],
-                    "gradle_ignored_metadata_files": sorted(list(content_comp["gradle_ignored_metadata_files"]))
-                }
-                results["artifacts_content_comparison"].append(content_comp_summary)
+    # Both-missing returned above, so the sections below always have at least one output dir to look at
+    maven_artifacts = list_artifacts(maven_target_str) if maven_target_exists else {}
+    gradle_artifacts = list_artifacts(os.path.join(gradle_build_str, 'libs')) if 'libs' in gradle_build_children else {}
+    maven_artifact_names, gradle_artifact_names = list(maven_artifacts), list(gradle_artifacts)
+    results["artifact_details"] = f"Maven artifacts: {maven_artifact_names or 'None'}. Gradle artifacts: {gradle_artifact_names or 'None'}."
+
+    if not maven_artifact_names and not gradle_artifact_names: results["artifact_comparison_status"] = "None Found (Both)"
+    elif not maven_artifact_names and gradle_artifact_names : results["artifact_comparison_status"] = "Gradle Only"
+    elif maven_artifact_names and not gradle_artifact_names: results["artifact_comparison_status"] = "Maven Only"
+    elif maven_artifact_names == gradle_artifact_names:
+        results["artifact_comparison_status"] = "Match (Names)"
+        all_archives_core_content_matched = True
+        any_gradle_produced_ignored_metadata = False
+
+        def compare_archive_pair(archive_name):
+            m_path, g_path = maven_artifacts[archive_name], gradle_artifacts[archive_name]
+            return compare_archive_contents(m_path, g_path) if archive_cache is None else compare_archive_contents_cached(m_path, g_path, archive_cache)
+
+        # Archive pairs are independent and their reads release the GIL, so several are compared at once
+        if len(maven_artifact_names) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(maven_artifact_names))) as ex:
+                content_comps = list(ex.map(compare_archive_pair, maven_artifact_names))
+        else:
+            content_comps = [compare_archive_pair(name) for name in maven_artifact_names]
+
+        for archive_name, content_comp in zip(maven_artifact_names, content_comps):
+            content_comp_summary = {
+                "archive_name": archive_name, "content_core_match": content_comp["core_match"],
+                "error": content_comp["error"],
+                "maven_core_files_count": content_comp["maven_core_files_count"],
+                "gradle_core_files_count": content_comp["gradle_core_files_count"],
+                "maven_only_core_files": sorted(content_comp["maven_only_core_files"]) if content_comp["maven_only_core_files"] else [],
+                "gradle_only_core_files": sorted(content_comp["gradle_only_core_files"]) if content_comp["gradle_only_core_files"] else [],
+                "maven_ignored_metadata_count": content_comp["maven_ignored_metadata_count"],
+                "gradle_ignored_metadata_count": content_comp["gradle_ignored_metadata_count"],
+                "gradle_ignored_metadata_files": sorted(content_comp["gradle_ignored_metadata_files"]) if content_comp["gradle_ignored_metadata_files"] else []
+            }
+            results["artifacts_content_comparison"].append(content_comp_summary)
+
+            if content_comp["error"]:
+                results["artifact_comparison_status"] = f"Error Comparing Content ({archive_name})"
+                all_archives_core_content_matched = False
+                results["overall_notes"].append(f"Artifact Error ({archive_name}): {content_comp['error']}")
+                break
+            if not content_comp["core_match"]: all_archives_core_content_matched = False
+            if content_comp["gradle_ignored_metadata_count"] > 0: any_gradle_produced_ignored_metadata = True
+
+        if "Error Comparing Content" not in results["artifact_comparison_status"]:
+            if all_archives_core_content_matched:
+                results["artifact_comparison_status"] = "Match (Core Content)"
+            else:
+                results["artifact_comparison_status"] = "Core Content Mismatch"
 
-                if content_comp["error"]:
-                    results["artifact_comparison_status"] = f"Error Comparing Content ({m_path.name})"
-                    all_archives_core_content_matched = False
-                    results["overall_notes"].append(f"Artifact Error ({m_path.name}): {content_comp['error']}")
-                    break
-                if not content_comp["core_match"]: all_archives_core_content_matched = False
-                if content_comp["gradle_ignored_metadata_count"] > 0: any_gradle_produced_ignored_metadata = True
-
-            if "Error Comparing Content" not in results["artifact_comparison_status"]:
-                if all_archives_core_content_matched:
-                    results["artifact_comparison_status"] = "Match (Core Content)"
-                else:
-                    results["artifact_comparison_status"] = "Core Content Mismatch"
-
-            if any_gradle_produced_ignored_metadata:
-                 results["overall_notes"].append(f"Note: Gradle artifact(s) contain ignored metadata files (e.g., in META-INF/maven/ or META-INF/jpms.args). Review if intended.")
-        else: results["artifact_comparison_status"] = "Structure Mismatch (Names)"
-    else: results["artifact_comparison_status"] = "Not Built"
+        if any_gradle_produced_ignored_metadata:
+             results["overall_notes"].append(f"Note: Gradle artifact(s) contain ignored metadata files (e.g., in META-INF/maven/ or META-INF/jpms.args). Review if intended.")
+    else: results["artifact_comparison_status"] = "Structure Mismatch (Names)"
 
     # --- Compiled Classes (condensed for brevity, same as original) ---
-    maven_classes_dir = maven_target_dir / 'classes'
-    gradle_class_locs = ['java/main', 'kotlin/main', 'scala/main', 'groovy/main']
-    gradle_classes_dirs_to_check = [gradle_build_dir / 'classes' / loc for loc in gradle_class_locs if (gradle_build_dir / 'classes' / loc).exists()]
-    maven_classes_exist = maven_classes_dir.exists() and results["maven_target_exists"] == "Yes"
-    gradle_classes_exist = bool(gradle_classes_dirs_to_check) and results["gradle_build_exists"] == "Yes"
-    if maven_classes_exist and gradle_classes_exist:
-        maven_class_files = set(p.relative_to(maven_classes_dir) for p in maven_classes_dir.rglob('*.class'))
-        gradle_class_files_combined = set()
-        for gcd in gradle_classes_dirs_to_check: gradle_class_files_combined.update(p.relative_to(gcd) for p in gcd.rglob('*.class'))
+    maven_classes_dir = os.path.join(maven_target_str, 'classes')
+    gradle_classes_root = os.path.join(gradle_build_str, 'classes')
+    # One listing of build/classes tells which language dirs exist; only those get a stat for their main/ dir
+    gradle_class_langs = (list_dir_names(gradle_classes_root) or set()) if 'classes' in gradle_build_children else set()
+    gradle_classes_dirs_to_check = [d for d in (os.path.join(gradle_classes_root, lang, 'main') for lang in GRADLE_CLASS_LANGUAGES if lang in gradle_class_langs) if os.path.isdir(d)]
+    maven_classes_exist = 'classes' in maven_target_children
+    gradle_classes_exist = bool(gradle_classes_dirs_to_check)
+    # Archives that are byte-for-byte the same hold the same classes, so those projects skip the classes/ walk
+    artifacts_identical = (hash_check and results["artifact_comparison_status"] == "Match (Core Content)" and
+                           all(archives_identical(maven_artifacts[n], gradle_artifacts[n], archive_cache) for n in maven_artifact_names))
+    # Each class dir is walked exactly once, straight into the combined set; the branches below only read these sets
+    maven_class_files, gradle_class_files_combined = set(), set()
+    if not artifacts_identical:
+        if maven_classes_exist and gradle_classes_exist:
+            # As with the archive reads, the two trees are walked concurrently so their directory reads overlap on cold storage
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                maven_walk = ex.submit(collect_class_files, maven_classes_dir, maven_class_files)
+                for gcd in gradle_classes_dirs_to_check: collect_class_files(gcd, gradle_class_files_combined)
+                maven_walk.result()
+        else:
+            if maven_classes_exist: collect_class_files(maven_classes_dir, maven_class_files)
+            for gcd in gradle_classes_dirs_to_check: collect_class_files(gcd, gradle_class_files_combined)
+    if artifacts_identical: results["classes_comparison_status"], results["classes_details"] = "Match (Artifacts Identical)", "Not walked; all artifacts are byte-identical."
+    elif maven_classes_exist and gradle_classes_exist:
         if maven_class_files == gradle_class_files_combined: results["classes_comparison_status"], results["classes_details"] = "Match", f"{len(maven_class_files)} .class file(s)"
-        else: results["classes_comparison_status"] = "Mismatch"; m_only,g_only = len(maven_class_files-gradle_class_files_combined), len(gradle_class_files_combined-maven_class_files); results["classes_details"] = f"M-total: {len(maven_class_files)}, G-total: {len(gradle_class_files_combined)}. M-only: {m_only}, G-only: {g_only}."
-    elif maven_classes_exist: results["classes_comparison_status"], results["classes_details"] = "Maven Only", f"{len(list(maven_classes_dir.rglob('*.class')))} .class file(s)"
-    elif gradle_classes_exist: results["classes_comparison_status"], results["classes_details"] = "Gradle Only", f"{sum(len(list(gcd.rglob('*.class'))) for gcd in gradle_classes_dirs_to_check)} .class file(s)"
-    elif results["maven_target_exists"] == "Yes" and results["gradle_build_exists"] == "Yes": results["classes_comparison_status"] = "None Found (Both)"
+        else: results["classes_comparison_status"] = "Mismatch"; m_only = sum(1 for f in maven_class_files if f not in gradle_class_files_combined); g_only = len(gradle_class_files_combined) - (len(maven_class_files) - m_only); results["classes_details"] = f"M-total: {len(maven_class_files)}, G-total: {len(gradle_class_files_combined)}. M-only: {m_only}, G-only: {g_only}."
+    elif maven_classes_exist: results["classes_comparison_status"], results["classes_details"] = "Maven Only", f"{len(maven_class_files)} .class file(s)"
+    elif gradle_classes_exist: results["classes_comparison_status"], results["classes_details"] = "Gradle Only", f"{len(gradle_class_files_combined)} .class file(s)"
+    elif maven_target_exists and gradle_build_exists: results["classes_comparison_status"] = "None Found (Both)"
     else: results["classes_comparison_status"] = "Not Built"
 
     # --- Test Reports ---
-    maven_test_reports_dir = maven_target_dir / 'surefire-reports'
+    maven_test_reports_dir = os.path.join(maven_target_str, 'surefire-reports')
     # Corrected path for Gradle XML test reports
-    gradle_xml_test_reports_dir = gradle_build_dir / 'test-results' / 'test'
+    gradle_xml_test_reports_dir = os.path.join(gradle_build_str, 'test-results', 'test')
 
-    maven_reports_exist = maven_test_reports_dir.exists() and results["maven_target_exists"] == "Yes"
-    # Check existence of the correct Gradle XML reports directory
-    gradle_xml_reports_exist = gradle_xml_test_reports_dir.exists() and results["gradle_build_exists"] == "Yes"
+    # Listing a reports dir doubles as its existence check
+    m_xml = count_test_reports(maven_test_reports_dir) if 'surefire-reports' in maven_target_children else None
+    # Count XML files in the correct Gradle XML reports directory
+    g_xml = count_test_reports(gradle_xml_test_reports_dir) if 'test-results' in gradle_build_children else None
+    maven_reports_exist, gradle_xml_reports_exist = m_xml is not None, g_xml is not None
+    m_xml, g_xml = m_xml or 0, g_xml or 0
 
     if maven_reports_exist and gradle_xml_reports_exist:
-        m_xml = len(list(maven_test_reports_dir.glob('TEST-*.xml')))
-        # Count XML files in the correct Gradle XML reports directory
-        g_xml = len(list(gradle_xml_test_reports_dir.glob('TEST-*.xml')))
-
         if m_xml == g_xml and m_xml > 0:
             results["test_reports_status"], results["test_reports_details"] = "Match", f"{m_xml} XML report(s)"
         elif m_xml > 0 or g_xml > 0:
@@ -243,11 +535,10 @@ def compare_outputs(project_path, maven_target_dir, gradle_build_dir):
         else:
             results["test_reports_status"], results["test_reports_details"] = "None Found (Both)", "No XML reports."
     elif maven_reports_exist:
-        results["test_reports_status"], results["test_reports_details"] = "Maven Only", f"{len(list(maven_test_reports_dir.glob('TEST-*.xml')))} XML report(s)"
+        results["test_reports_status"], results["test_reports_details"] = "Maven Only", f"{m_xml} XML report(s)"
     elif gradle_xml_reports_exist: # Check the correct Gradle XML reports directory
-        # Count XML files in the correct Gradle XML reports directory
-        results["test_reports_status"], results["test_reports_details"] = "Gradle Only", f"{len(list(gradle_xml_test_reports_dir.glob('TEST-*.xml')))} XML report(s)"
-    elif results["maven_target_exists"] == "Yes" and results["gradle_build_exists"] == "Yes":
+        results["test_reports_status"], results["test_reports_details"] = "Gradle Only", f"{g_xml} XML report(s)"
+    elif maven_target_exists and gradle_build_exists:
         results["test_reports_status"] = "None Found (Both)"
     else:
         results["test_reports_status"] = "Not Built"
@@ -255,85 +546,167 @@ def compare_outputs(project_path, maven_target_dir, gradle_build_dir):
     results["overall_status"] = determine_overall_status(results)
     return results
 
+# Archive cache loaded by main() (None with --no-cache), handed to each worker process once through the pool initializer
+_worker_archive_cache = {}
+_worker_hash_check = False
+
+def _init_worker(archive_cache, hash_check=False):
+    global _worker_archive_cache, _worker_hash_check
+    _worker_archive_cache, _worker_hash_check = archive_cache, hash_check
+
+def _analyze_project(proj_to_analyze):
+    """Runs compare_outputs for one project in a worker; returns (results, archive cache entries it used or added)."""
+    proj_path = proj_to_analyze['path']
+    proj_path_str = os.fspath(proj_path)
+    used_cache_entries = {}
+    cache = None if _worker_archive_cache is None else ChainMap(used_cache_entries, _worker_archive_cache)
+    comparison_data = compare_outputs(proj_path, os.path.join(proj_path_str, 'target'), os.path.join(proj_path_str, 'build'),
+                                      cache, _worker_hash_check)
+    return comparison_data, used_cache_entries
+
+def analyze_projects(projects, archive_cache, max_workers=None, hash_check=False):
+    """Yields _analyze_project results in discovery order. Scans of more than PARALLEL_PROJECT_THRESHOLD
+    projects are spread over a process pool of max_workers (default: CPU count); smaller ones, or
+    max_workers=1, run in-process to skip the pool start-up."""
+    if len(projects) <= PARALLEL_PROJECT_THRESHOLD or max_workers == 1:
+        _init_worker(archive_cache, hash_check)
+        yield from map(_analyze_project, projects)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # Pulls in multiprocessing, so only imported for pooled scans
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(archive_cache, hash_check)) as ex:
+        yield from ex.map(_analyze_project, projects, chunksize=4)
+
 def generate_summary_table_for_file(all_project_results):
     if not all_project_results: return "No projects matching criteria to summarize."
     headers = ["Project", "Overall Status", "Artifacts (Core)", "Classes", "Tests"]
-    table_data_rows = []
-    for res in all_project_results:
-        table_data_rows.append({
-            "Project": res.get("project_path", "N/A"), "Overall Status": res.get("overall_status", "N/A"),
-            "Artifacts (Core)": res.get("artifact_comparison_status", "N/A"),
-            "Classes": res.get("classes_comparison_status", "N/A"), "Tests": res.get("test_reports_status", "N/A")
-        })
-    col_widths = {h: len(h) for h in headers}
-    for row in table_data_rows:
-        for h_name in headers: col_widths[h_name] = max(col_widths[h_name], len(str(row.get(h_name, ""))))
-    for h_name in col_widths: col_widths[h_name] += 2
-    header_str = " | ".join([f"{h:<{col_widths[h]}}" for h in headers])
-    sep_str = "-+-".join(["-" * col_widths[h] for h in headers])
-    row_strs = [" | ".join([f"{str(row.get(h, '')):<{col_widths[h]}}" for h in headers]) for row in table_data_rows]
-    return header_str + "\n" + sep_str + "\n" + "\n".join(row_strs)
-
-def generate_detailed_sections_for_file(all_project_results):
-    report_lines = ["\n\n", "-----------------------------------", " DETAILED PER-MODULE BREAKDOWN ", "-----------------------------------", ""]
+    result_keys = ["project_path", "overall_status", "artifact_comparison_status", "classes_comparison_status", "test_reports_status"]
+    rows = [tuple(str(res.get(k, "N/A")) for k in result_keys) for res in all_project_results]
+    col_widths = [max(len(h), max(len(cell) for cell in col)) + 2 for h, col in zip(headers, zip(*rows))]
+    # One format string for the whole table, so each row is a single format call
+    row_fmt = " | ".join(f"{{:<{w}}}" for w in col_widths)
+    sep_str = "-+-".join(["-" * w for w in col_widths])
+    return "\n".join([row_fmt.format(*headers), sep_str] + [row_fmt.format(*row) for row in rows])
+
+# Fixed parts of each per-module section, rendered in one format_map call against the result dict
+PROJECT_SECTION_HEAD_TEMPLATE = (
+    "========================================================================\n"
+    "Project: {project_path}\nFull Path: {full_project_path}\n"
+    "Overall Status: {overall_status}\n------------------------------------------------------------------------\n\n"
+    "  Maven Target Dir Exists: {maven_target_exists}\n"
+    "  Gradle Build Dir Exists: {gradle_build_exists}\n\n"
+    "  Artifacts:\n    Core Content Status: {artifact_comparison_status}\n"
+    "    Build Outputs Found: {artifact_details}\n"
+)
+PROJECT_SECTION_TAIL_TEMPLATE = (
+    "\n"
+    "  Compiled Classes:\n    Status: {classes_comparison_status}\n"
+    "    Details: {classes_details}\n\n"
+    "  Test Reports:\n    Status: {test_reports_status}\n"
+    "    Details: {test_reports_details}\n\n"
+)
+
+def write_detailed_sections_for_file(out, all_project_results):
+    """Writes the per-module breakdown straight to out (a file or io.StringIO), one line at a time."""
+    w = out.write
+
+    def write_listing(files, limit, indent):
+        w("".join(f"{indent}- {f}\n" for f in files[:limit]))
+        if len(files) > limit: w(f"{indent}... and {len(files) - limit} more.\n")
+
+    w("\n\n\n-----------------------------------\n DETAILED PER-MODULE BREAKDOWN \n-----------------------------------\n\n")
     for res in all_project_results:
-        report_lines.extend([
-            "========================================================================",
-            f"Project: {res['project_path']}", f"Full Path: {res['full_project_path']}",
-            f"Overall Status: {res['overall_status']}", "------------------------------------------------------------------------\n",
-            f"  Maven Target Dir Exists: {res['maven_target_exists']}",
-            f"  Gradle Build Dir Exists: {res['gradle_build_exists']}\n",
-            "  Artifacts:", f"    Core Content Status: {res['artifact_comparison_status']}",
-            f"    Build Outputs Found: {res['artifact_details']}"
-        ])
+        w(PROJECT_SECTION_HEAD_TEMPLATE.format_map(res))
         if res.get("artifacts_content_comparison"):
             for content_comp in res["artifacts_content_comparison"]:
-                report_lines.append(f"    Content Comparison for '{content_comp['archive_name']}':")
+                w(f"    Content Comparison for '{content_comp['archive_name']}':\n")
                 if content_comp["error"]:
-                    report_lines.append(f"      ERROR: {content_comp['error']}"); continue
-                report_lines.extend([
-                    f"      Core Content Match: {'Yes' if content_comp['content_core_match'] else 'No'}",
-                    f"        Maven Core Files Count: {content_comp['maven_core_files_count']}",
-                    f"        Gradle Core Files Count: {content_comp['gradle_core_files_count']}"
-                ])
+                    w(f"      ERROR: {content_comp['error']}\n"); continue
+                w(f"      Core Content Match: {'Yes' if content_comp['content_core_match'] else 'No'}\n")
+                w(f"        Maven Core Files Count: {content_comp['maven_core_files_count']}\n")
+                w(f"        Gradle Core Files Count: {content_comp['gradle_core_files_count']}\n")
                 if not content_comp["content_core_match"]:
                     if content_comp["maven_only_core_files"]:
-                        report_lines.append("        CORE files found in Maven archive ONLY (expected to be in Gradle too):")
-                        for f in content_comp["maven_only_core_files"][:15]: report_lines.append(f"          - {f}")
-                        if len(content_comp["maven_only_core_files"]) > 15: report_lines.append(f"          ... and {len(content_comp['maven_only_core_files']) - 15} more.")
+                        w("        CORE files found in Maven archive ONLY (expected to be in Gradle too):\n")
+                        write_listing(content_comp["maven_only_core_files"], 15, "          ")
                     if content_comp["gradle_only_core_files"]:
-                        report_lines.append("        CORE files found in Gradle archive ONLY (unexpectedly):")
-                        for f in content_comp["gradle_only_core_files"][:15]: report_lines.append(f"          - {f}")
-                        if len(content_comp["gradle_only_core_files"]) > 15: report_lines.append(f"          ... and {len(content_comp['gradle_only_core_files']) - 15} more.")
+                        w("        CORE files found in Gradle archive ONLY (unexpectedly):\n")
+                        write_listing(content_comp["gradle_only_core_files"], 15, "          ")
 
                 if content_comp['gradle_ignored_metadata_count'] > 0:
-                    report_lines.append(f"      (WARNING) Gradle archive unexpectedly contained {content_comp['gradle_ignored_metadata_count']} ignored metadata file(s) (e.g., in META-INF/maven/, META-INF/jpms.args):")
-                    for f in content_comp.get("gradle_ignored_metadata_files", [])[:10]:
-                        report_lines.append(f"        - {f}")
-                    if len(content_comp.get("gradle_ignored_metadata_files", [])) > 10:
-                        report_lines.append(f"        ... and {len(content_comp.get('gradle_ignored_metadata_files', [])) - 10} more.")
-                    report_lines.append(f"        (For context, Maven archive contained {content_comp['maven_ignored_metadata_count']} such metadata file(s)).")
-                elif content_comp['maven_ignored_metadata_count'] > 0 and content_comp['gradle_ignored_metadata_count'] == 0:
-                    pass
-        report_lines.append("")
-
-        report_lines.extend([
-            "  Compiled Classes:", f"    Status: {res['classes_comparison_status']}",
-            f"    Details: {res['classes_details']}\n",
-            "  Test Reports:", f"    Status: {res['test_reports_status']}",
-            f"    Details: {res['test_reports_details']}\n"
-        ])
+                    w(f"      (WARNING) Gradle archive unexpectedly contained {content_comp['gradle_ignored_metadata_count']} ignored metadata file(s) (e.g., in META-INF/maven/, META-INF/jpms.args):\n")
+                    write_listing(content_comp.get("gradle_ignored_metadata_files", []), 10, "        ")
+                    w(f"        (For context, Maven archive contained {content_comp['maven_ignored_metadata_count']} such metadata file(s)).\n")
+        w(PROJECT_SECTION_TAIL_TEMPLATE.format_map(res))
         if res["overall_notes"]:
-            report_lines.append("  Overall Notes:")
-            for note in res["overall_notes"]: report_lines.append(f"    - {note}")
-            report_lines.append("")
-    return "\n".join(report_lines)
-
-def main():
-    base_search_path_str = input("Enter the root path to search for projects: ")
+            w("  Overall Notes:\n")
+            for note in res["overall_notes"]: w(f"    - {note}\n")
+            w("\n")
+
+# Report preamble up to the summary table; only the timestamp and search path vary per run
+REPORT_HEADER_TEMPLATE = (
+    "========================================================================\n"
+    "          Maven to Gradle Build Comparison Report         \n"
+    "========================================================================\n"
+    "Generated on: {generated_on}\n"
+    "Searched Path: {search_path}\n\n"
+    "Methodology: Compares outputs from Maven and Gradle builds for modules with both 'pom.xml' and 'build.gradle[.kts]'.\n"
+    "Artifact comparison distinguishes core application content from ignored metadata (like META-INF/maven/*, META-INF/jpms.args).\n"
+    "The absence of such ignored metadata in Gradle output (if present in Maven) is generally the expected outcome.\n\n"
+    "-----------------------------------\n"
+    "           SUMMARY TABLE           \n"
+    "-----------------------------------\n"
+)
+
+def write_detailed_file_report(out, all_project_results, search_path_str):
+    """Writes the complete report (header, summary table, per-module breakdown) to out."""
+    from datetime import datetime
+    generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    out.write(REPORT_HEADER_TEMPLATE.format(generated_on=generated_on, search_path=search_path_str) +
+              generate_summary_table_for_file(all_project_results) + "\n")
+    write_detailed_sections_for_file(out, all_project_results)
+
+# Per-project columns of the CSV report, in output order
+CSV_REPORT_FIELDS = ["project_path", "full_project_path", "overall_status", "maven_target_exists", "gradle_build_exists",
+                     "artifact_comparison_status", "artifact_details", "classes_comparison_status", "classes_details",
+                     "test_reports_status", "test_reports_details"]
+
+def write_csv_report(out, all_project_results):
+    """Writes one CSV row of summary fields per project (out must be opened with newline='')."""
+    import csv
+    writer = csv.DictWriter(out, fieldnames=CSV_REPORT_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(all_project_results)
+
+def write_jsonl_report(out, all_project_results):
+    """Writes each project's full result dict as one JSON line."""
+    out.writelines(json.dumps(res) + "\n" for res in all_project_results)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compares Maven and Gradle build outputs of modules that have both build files.")
+    parser.add_argument('path', nargs='?', help="root path to search for projects (prompted for when omitted on a terminal)")
+    parser.add_argument('-o', '--output', help="write the detailed report to this file instead of asking")
+    parser.add_argument('--format', choices=['text', 'csv', 'jsonl'], default='text',
+                        help="report format: the detailed text report (default), or one row/line per project")
+    parser.add_argument('-j', '--jobs', type=int, help="worker processes used to compare projects (default: CPU count)")
+    parser.add_argument('--hash-check', action='store_true',
+                        help="skip the classes comparison for projects whose artifacts are byte-identical (BLAKE3 if installed, else SHA-256)")
+    parser.add_argument('--no-nested', dest='nested', action='store_false',
+                        help="don't look for modules nested inside a project that was already matched")
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help="don't read or write the archive comparison cache (kept per search root under $XDG_CACHE_HOME or ~/.cache)")
+    args = parser.parse_args(argv)
+    if args.path is None and not sys.stdin.isatty(): parser.error("path is required when not running interactively")
+    if args.jobs is not None and args.jobs < 1: parser.error("--jobs must be at least 1")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Without a path argument the original prompt-driven flow is kept for terminal use
+    interactive = args.path is None
+    base_search_path_str = input("Enter the root path to search for projects: ") if interactive else args.path
     if not os.path.isdir(base_search_path_str):
         print(f"Error: Path '{base_search_path_str}' is not a valid directory.")
-        return
+        return 1
 
     base_search_path_resolved = Path(base_search_path_str).resolve()
     all_results_data = []
@@ -342,47 +715,49 @@ def main():
     print("Will only process modules containing BOTH 'pom.xml' and 'build.gradle[.kts]'.")
     print("Important: Ensure relevant projects have been built with BOTH Maven and Gradle for comparison.")
 
-    projects_to_analyze = find_project_roots(base_search_path_resolved)
+    projects_to_analyze = find_project_roots(base_search_path_resolved, descend_into_matches=args.nested)
     if not projects_to_analyze:
         print(f"\nNo modules found under '{base_search_path_resolved}' that contain BOTH 'pom.xml' and a Gradle build file.")
         return
 
     print(f"\n--- Processing {len(projects_to_analyze)} project(s) matching criteria ---")
-    for proj_to_analyze in projects_to_analyze:
-        proj_path, proj_name = proj_to_analyze['path'], proj_to_analyze['name']
-        print(f"Module: {proj_name:<40} ...analyzing...", end="\r", flush=True)
-        comparison_data = compare_outputs(proj_path, proj_path / 'target', proj_path / 'build')
+    cache_file = archive_cache_file(base_search_path_resolved)
+    archive_cache = load_archive_cache(cache_file) if args.cache else None
+    used_cache_entries = {}
+    # Projects are independent, so they are compared in parallel; results arrive in discovery order.
+    # Status lines are written in batches of 32 rather than flushed one print at a time
+    status_lines = []
+    for proj_to_analyze, (comparison_data, project_cache_entries) in zip(projects_to_analyze, analyze_projects(projects_to_analyze, archive_cache, args.jobs, args.hash_check)):
         all_results_data.append(comparison_data)
-        print(f"Module: {proj_name:<40} | Status: {comparison_data['overall_status']}")
+        used_cache_entries.update(project_cache_entries)
+        status_lines.append(f"Module: {proj_to_analyze['name']:<40} | Status: {comparison_data['overall_status']}\n")
+        if len(status_lines) >= 32:
+            sys.stdout.write("".join(status_lines)); sys.stdout.flush(); status_lines.clear()
+    sys.stdout.write("".join(status_lines))
+    # Only the entries this run looked up are kept, and an unchanged cache isn't rewritten. Digests are only
+    # looked up under --hash-check, so a run without it carries them over for the next one that uses them.
+    if archive_cache is not None:
+        if not args.hash_check:
+            used_cache_entries.update((k, v) for k, v in archive_cache.items() if k.startswith(DIGEST_CACHE_KEY_PREFIX))
+        if used_cache_entries != archive_cache: save_archive_cache(used_cache_entries, cache_file)
 
     if not all_results_data: print("\nNo data collected."); return
 
-    if input("\nSave detailed comparison report to a text file? (y/n): ").strip().lower() == 'y':
+    if args.output: fname = args.output
+    elif interactive and input("\nSave detailed comparison report to a text file? (y/n): ").strip().lower() == 'y':
+        from datetime import datetime
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        fname = input(f"Enter filename (default: build_comparison_report_{ts}.txt): ").strip() or f"build_comparison_report_{ts}.txt"
-        try:
-            header = [
-                "========================================================================",
-                "          Maven to Gradle Build Comparison Report         ",
-                "========================================================================",
-                f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                f"Searched Path: {str(base_search_path_resolved)}\n",
-                "Methodology: Compares outputs from Maven and Gradle builds for modules with both 'pom.xml' and 'build.gradle[.kts]'.",
-                "Artifact comparison distinguishes core application content from ignored metadata (like META-INF/maven/*, META-INF/jpms.args).",
-                "The absence of such ignored metadata in Gradle output (if present in Maven) is generally the expected outcome.\n",
-                "-----------------------------------", "           SUMMARY TABLE           ", "-----------------------------------",
-            ]
-            summary_table = generate_summary_table_for_file(all_results_data)
-            detailed_sections = generate_detailed_sections_for_file(all_results_data)
-            with open(fname, 'w', encoding='utf-8') as f:
-                f.write("\n".join(header) + "\n" + summary_table + "\n" + detailed_sections)
-            print(f"Detailed report saved to '{fname}'")
-        except IOError as e: print(f"Error saving file: {e}")
-    else: print("Report not saved.")
+        default_fname = f"build_comparison_report_{ts}.{'txt' if args.format == 'text' else args.format}"
+        fname = input(f"Enter filename (default: {default_fname}): ").strip() or default_fname
+    else: print("Report not saved."); return
+    try:
+        # A large buffer turns the many small report writes into a handful of syscalls
+        with open(fname, 'w', encoding='utf-8', newline='' if args.format == 'csv' else None, buffering=1 << 20) as f:
+            if args.format == 'csv': write_csv_report(f, all_results_data)
+            elif args.format == 'jsonl': write_jsonl_report(f, all_results_data)
+            else: write_detailed_file_report(f, all_results_data, str(base_search_path_resolved))
+        print(f"Detailed report saved to '{fname}'")
+    except IOError as e: print(f"Error saving file: {e}"); return 1
 
 if __name__ == '__main__':
-    main()
-
-
-
-for j := i+1; j < len(nums); j++
\ No newline at end of file
+    sys.exit(main())
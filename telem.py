@@ -19,36 +19,132 @@ options:
   endpoint:
     type: str
     description: The OTLP endpoint (e.g., "https://collector.internal:4317").
-    env: [OTEL_EXPORTER_OTLP_ENDPOINT]
+    env:
+      - name: OTEL_EXPORTER_OTLP_ENDPOINT
     ini:
       - section: callback_skynet_reporting
         key: endpoint
   neuron_team:
     type: str
     description: The team responsible for this playbook run, used for service naming.
-    env: [NEURON_TEAM]
+    env:
+      - name: NEURON_TEAM
     ini:
       - section: callback_skynet_reporting
         key: neuron_team
   neuron_app:
     type: str
     description: The application this playbook targets, used for service naming.
-    env: [NEURON_APP]
+    env:
+      - name: NEURON_APP
     ini:
       - section: callback_skynet_reporting
         key: neuron_app
   traceparent:
     type: str
     description: The W3C Trace Context header (traceparent) to link this playbook run to a parent trace.
-    env: [TRACEPARENT]
+    env:
+      - name: TRACEPARENT
   enable_debug_logging:
     default: false
     type: bool
     description: Enable verbose logging to the Ansible console for debugging the callback itself.
-    env: [ANSIBLE_SKYNET_DEBUG_LOGGING]
+    env:
+      - name: ANSIBLE_SKYNET_DEBUG_LOGGING
     ini:
       - section: callback_skynet_reporting
         key: enable_debug_logging
+  bsp_max_queue_size:
+    default: 8192
+    type: int
+    description: Maximum number of finished spans buffered for export before new spans are dropped.
+    env:
+      - name: OTEL_BSP_MAX_QUEUE_SIZE
+    ini:
+      - section: callback_skynet_reporting
+        key: bsp_max_queue_size
+  bsp_max_export_batch_size:
+    default: 512
+    type: int
+    description: Maximum number of spans sent in a single export request. Must not exceed O(bsp_max_queue_size).
+    env:
+      - name: OTEL_BSP_MAX_EXPORT_BATCH_SIZE
+    ini:
+      - section: callback_skynet_reporting
+        key: bsp_max_export_batch_size
+  bsp_schedule_delay_millis:
+    default: 1000
+    type: int
+    description: Delay in milliseconds between two consecutive exports of queued spans.
+    env:
+      - name: OTEL_BSP_SCHEDULE_DELAY
+    ini:
+      - section: callback_skynet_reporting
+        key: bsp_schedule_delay_millis
+  bsp_export_timeout_millis:
+    default: 10000
+    type: int
+    description: Maximum time in milliseconds a single export request may take.
+    env:
+      - name: OTEL_BSP_EXPORT_TIMEOUT
+    ini:
+      - section: callback_skynet_reporting
+        key: bsp_export_timeout_millis
+  otlp_connection_pool_size:
+    default: 1
+    type: int
+    description:
+      - Number of independent OTLP exporters (each with its own connection and batch queue) that finished spans
+        are distributed across round-robin. Raise this when a single connection cannot keep up with span bursts.
+    env:
+      - name: ANSIBLE_SKYNET_OTLP_CONNECTION_POOL_SIZE
+    ini:
+      - section: callback_skynet_reporting
+        key: otlp_connection_pool_size
+  otlp_http_pool_size:
+    type: int
+    description:
+      - Maximum number of keep-alive connections in the HTTP session shared by the http/protobuf exporters.
+        Defaults to O(otlp_connection_pool_size).
+    env:
+      - name: ANSIBLE_SKYNET_OTLP_HTTP_POOL_SIZE
+    ini:
+      - section: callback_skynet_reporting
+        key: otlp_http_pool_size
+  record_skipped:
+    default: false
+    type: bool
+    description: Emit a span for skipped task results. Off by default since conditional tasks can dominate span volume.
+    env:
+      - name: ANSIBLE_SKYNET_RECORD_SKIPPED
+    ini:
+      - section: callback_skynet_reporting
+        key: record_skipped
+  flush_timeout_millis:
+    default: 5000
+    type: int
+    description:
+      - How long the end of the run waits, in total, for queued spans to be exported and the exporters shut down.
+        Spans still pending after that are dropped.
+    env:
+      - name: ANSIBLE_SKYNET_FLUSH_TIMEOUT_MILLIS
+    ini:
+      - section: callback_skynet_reporting
+        key: flush_timeout_millis
+  grpc_keepalive_time_millis:
+    default: 0
+    type: int
+    description:
+      - Interval of HTTP/2 keepalive pings on the OTLP/gRPC channel, so an idle connection is not dropped by NAT or
+        load balancers between task bursts. 0 (the default) disables keepalive pings.
+      - Only enable this once the collector's keepalive enforcement policy allows pings at this rate without active
+        streams; with gRPC's defaults (5 minutes, no pings without streams) the collector answers with GOAWAY
+        too_many_pings and drops the connection.
+    env:
+      - name: ANSIBLE_SKYNET_GRPC_KEEPALIVE_TIME_MILLIS
+    ini:
+      - section: callback_skynet_reporting
+        key: grpc_keepalive_time_millis
 requirements:
   - opentelemetry-api
   - opentelemetry-sdk
@@ -76,28 +172,100 @@ enable_debug_logging = true
 export TRACEPARENT="00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
 """
 
+import itertools
 import os
 import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from importlib.util import find_spec
 from os.path import basename
 
 from ansible.errors import AnsibleError
 from ansible.module_utils.ansible_release import __version__ as ansible_version
 from ansible.plugins.callback import CallbackBase
 
+# The SDK and exporters are only imported once a trace is actually started (see _load_otel), so loading
+# the plugin for a run that never traces stays cheap; here we just check that they are installed.
 try:
+    HAS_OTEL = find_spec('opentelemetry.sdk') is not None and find_spec('opentelemetry.exporter.otlp') is not None
+except ImportError:
+    HAS_OTEL = False
+
+_PROPAGATOR = None
+_OK_STATUS = _ERROR_STATUS = None
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class _OtelConfig:
+    """Callback options, resolved once in set_options."""
+    endpoint: str | None = None
+    protocol: str = 'grpc'
+    team: str | None = None
+    app: str | None = None
+    traceparent: str | None = None
+    pool_size: int = 1
+    http_pool_size: int = 1
+    bsp: dict = field(default_factory=dict)
+    record_skipped: bool = False
+    flush_timeout_millis: int = 5000
+    grpc_keepalive_time_millis: int = 0
+
+    @property
+    def service_name(self):
+        return f"ansible.skynet.{self.team or 'unknown_team'}.{self.app or 'unknown_app'}"
+
+
+def _load_otel():
+    """Import the OpenTelemetry SDK into module globals on first use."""
+    global trace, SERVICE_NAME, Resource, TracerProvider, BatchSpanProcessor, SpanKind, Status, StatusCode
+    global _PROPAGATOR, _OK_STATUS, _ERROR_STATUS, _RoundRobinSpanProcessor
+    if _PROPAGATOR is not None: return
+
     from opentelemetry import trace
-    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter as GRPCSpanExporter
-    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter as HTTPSpanExporter
     from opentelemetry.sdk.resources import SERVICE_NAME, Resource
-    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
     from opentelemetry.sdk.trace.export import BatchSpanProcessor
     from opentelemetry.trace import SpanKind
     from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
     from opentelemetry.trace.status import Status, StatusCode
-    HAS_OTEL = True
-except ImportError as e:
-    HAS_OTEL = False
-    OTEL_IMPORT_ERROR = e
+
+    class _RoundRobinSpanProcessor(SpanProcessor):
+        """Hands each finished span to the next of several batch processors so exports run in parallel."""
+
+        def __init__(self, processors):
+            self._processors = processors
+            self._next_processor = itertools.cycle(processors).__next__
+
+        def on_end(self, span):
+            self._next_processor().on_end(span)
+
+        def _run_on_each(self, method, timeout_millis=None):
+            """Calls method on every child processor concurrently, joined against one overall deadline,
+            so a pool of N waits as long as its slowest child rather than N times the timeout."""
+            outcomes = [False] * len(self._processors)
+
+            def run(i, processor):
+                outcomes[i] = method(processor)
+
+            threads = [threading.Thread(target=run, args=(i, processor), daemon=True)
+                       for i, processor in enumerate(self._processors)]
+            for thread in threads: thread.start()
+            deadline = None if timeout_millis is None else time.monotonic() + timeout_millis / 1000
+            for thread in threads:
+                thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+            return all(outcomes)
+
+        def shutdown(self):
+            self._run_on_each(lambda processor: processor.shutdown())
+
+        def force_flush(self, timeout_millis=30000):
+            return self._run_on_each(lambda processor: processor.force_flush(timeout_millis), timeout_millis)
+
+    _OK_STATUS = Status(StatusCode.OK)
+    _ERROR_STATUS = Status(StatusCode.ERROR)
+    _PROPAGATOR = TraceContextTextMapPropagator()
 
 
 class CallbackModule(CallbackBase):
@@ -109,13 +277,16 @@ class CallbackModule(CallbackBase):
     def __init__(self, display=None):
         super(CallbackModule, self).__init__(display=display)
         if not HAS_OTEL:
-            raise AnsibleError(f'The opentelemetry libraries must be installed. Error: {OTEL_IMPORT_ERROR}')
+            raise AnsibleError('The opentelemetry libraries must be installed (opentelemetry-sdk, opentelemetry-exporter-otlp).')
 
         self.tracer = None
         self.tracer_provider = None
         self.playbook_span = None
+        self._playbook_context = None
+        self._root_context = None
         self.errors_in_playbook = 0
         self.debug_enabled = False
+        self._config = _OtelConfig()
 
     def _debug(self, msg):
         if self.debug_enabled:
@@ -124,35 +295,90 @@ class CallbackModule(CallbackBase):
     def set_options(self, task_keys=None, var_options=None, direct=None):
         super(CallbackModule, self).set_options(task_keys, var_options, direct)
         self.debug_enabled = self.get_option('enable_debug_logging')
+        pool_size = max(1, self.get_option('otlp_connection_pool_size'))
+        self._config = _OtelConfig(
+            endpoint=self.get_option('endpoint'),
+            protocol=os.getenv('OTEL_EXPORTER_OTLP_TRACES_PROTOCOL', 'grpc'),
+            team=self.get_option('neuron_team'),
+            app=self.get_option('neuron_app'),
+            traceparent=self.get_option('traceparent'),
+            pool_size=pool_size,
+            http_pool_size=max(1, self.get_option('otlp_http_pool_size') or pool_size),
+            bsp={
+                'max_queue_size': self.get_option('bsp_max_queue_size'),
+                'max_export_batch_size': self.get_option('bsp_max_export_batch_size'),
+                'schedule_delay_millis': self.get_option('bsp_schedule_delay_millis'),
+                'export_timeout_millis': self.get_option('bsp_export_timeout_millis'),
+            },
+            record_skipped=self.get_option('record_skipped'),
+            flush_timeout_millis=self.get_option('flush_timeout_millis'),
+            grpc_keepalive_time_millis=self.get_option('grpc_keepalive_time_millis'),
+        )
         self._debug("Options loaded.")
 
     def _init_otel(self):
         if self.tracer: return
 
-        team = self.get_option('neuron_team') or "unknown_team"
-        app = self.get_option('neuron_app') or "unknown_app"
-        service_name = f"ansible.skynet.{team}.{app}"
-
-        self._debug(f"Initializing OpenTelemetry SDK for service: {service_name}")
-        resource = Resource.create({SERVICE_NAME: service_name})
-        self.tracer_provider = TracerProvider(resource=resource)
-        protocol = os.getenv('OTEL_EXPORTER_OTLP_TRACES_PROTOCOL', 'grpc')
-        endpoint = self.get_option('endpoint')
+        config = self._config
+        protocol = config.protocol
+        endpoint = config.endpoint
 
         if not endpoint:
             self._display.warning("OTLP endpoint is not set. Traces will not be sent.")
             return
 
+        service_name = config.service_name
+        self._debug(f"Initializing OpenTelemetry SDK for service: {service_name}")
+        _load_otel()
+        # Run-wide constants live on the Resource, which is encoded once per export batch rather than per span
+        resource_attrs = {
+            SERVICE_NAME: service_name, "neuron.team": config.team, "neuron.app": config.app, "ansible.version": ansible_version,
+        }
+        resource = Resource.create({k: v for k, v in resource_attrs.items() if v is not None})
+        # v2_playbook_on_stats shuts the provider down under flush_timeout_millis; the SDK's own atexit
+        # shutdown would wait on a stuck export again, unbounded, after the playbook has finished
+        self.tracer_provider = TracerProvider(resource=resource, shutdown_on_exit=False)
+
         self._debug(f"Using OTLP protocol: {protocol} with endpoint: {endpoint}")
-        exporter = None
-        if protocol == 'grpc':
-            credentials = ssl.create_default_context()
-            exporter = GRPCSpanExporter(endpoint=endpoint, credentials=credentials)
-        elif protocol == 'http/protobuf':
-            exporter = HTTPSpanExporter(endpoint=endpoint)
-
-        if exporter:
-            processor = BatchSpanProcessor(exporter)
+        new_exporter = None
+        try:
+            # Only the exporter for the configured protocol is imported; the gRPC stack is the expensive one
+            if protocol == 'grpc':
+                from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter as GRPCSpanExporter
+                credentials = ssl.create_default_context()
+                channel_options = None
+                if config.grpc_keepalive_time_millis > 0:
+                    channel_options = (
+                        ("grpc.keepalive_time_ms", config.grpc_keepalive_time_millis),
+                        ("grpc.keepalive_timeout_ms", 10000),
+                        ("grpc.keepalive_permit_without_calls", 1),
+                        ("grpc.http2.max_pings_without_data", 0),
+                    )
+                new_exporter = lambda: GRPCSpanExporter(
+                    endpoint=endpoint, credentials=credentials, channel_options=channel_options
+                )
+            elif protocol == 'http/protobuf':
+                import requests
+                from requests.adapters import HTTPAdapter
+                from opentelemetry.exporter.otlp.proto.http import Compression
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter as HTTPSpanExporter
+                # One keep-alive session shared by every exporter in the pool, gzip unless compression is set via env
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=config.http_pool_size, pool_maxsize=config.http_pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                compression = None
+                if not (os.getenv('OTEL_EXPORTER_OTLP_TRACES_COMPRESSION') or os.getenv('OTEL_EXPORTER_OTLP_COMPRESSION')):
+                    compression = Compression.Gzip
+                new_exporter = lambda: HTTPSpanExporter(endpoint=endpoint, compression=compression, session=session)
+        except ImportError as e:
+            self._display.warning(f"OTLP exporter for protocol '{protocol}' is not installed ({e}). Traces will not be sent.")
+            return
+
+        if new_exporter:
+            # A larger queue absorbs bursts of task spans on big inventories without dropping them
+            processors = [BatchSpanProcessor(new_exporter(), **config.bsp) for _ in range(config.pool_size)]
+            processor = processors[0] if len(processors) == 1 else _RoundRobinSpanProcessor(processors)
             self.tracer_provider.add_span_processor(processor)
             trace.set_tracer_provider(self.tracer_provider)
             self.tracer = trace.get_tracer(self.CALLBACK_NAME, ansible_version)
@@ -166,46 +392,51 @@ class CallbackModule(CallbackBase):
 
         playbook_name = basename(playbook._file_name)
         self._debug(f"Starting trace for playbook: {playbook_name}")
-        traceparent = self.get_option('traceparent')
-        parent_context = TraceContextTextMapPropagator().extract({'traceparent': traceparent}) if traceparent else None
+        # TRACEPARENT is fixed for the whole run, so extract it once and reuse it for every playbook
+        parent_context = self._root_context
+        if parent_context is None and self._config.traceparent:
+            parent_context = self._root_context = _PROPAGATOR.extract({'traceparent': self._config.traceparent})
 
         self.playbook_span = self.tracer.start_span(
             name=f"playbook: {playbook_name}", kind=SpanKind.SERVER, context=parent_context
         )
+        self._playbook_context = trace.set_span_in_context(self.playbook_span)
         self.playbook_span.set_attribute("ansible.playbook.name", playbook_name)
-        self.playbook_span.set_attribute("neuron.team", self.get_option('neuron_team'))
-        self.playbook_span.set_attribute("neuron.app", self.get_option('neuron_app'))
-        self.playbook_span.set_attribute("ansible.version", ansible_version)
 
     def _create_task_result_span(self, result, status_string: str):
-        if not self.playbook_span: return
+        if self.tracer is None or self.playbook_span is None: return
 
         task = result._task
-        host = result._host
-        span_name = f"{task.get_name()} on {host.get_name()}"
-        self._debug(f"Creating span for result: {span_name}")
+        task_name = task.get_name()
+        host_name = result._host.get_name()
+        span_name = f"{task_name} on {host_name}"
+        if self.debug_enabled:
+            self._debug(f"Creating span for result: {span_name}")
 
-        parent_context = trace.set_span_in_context(self.playbook_span)
-        span = self.tracer.start_span(name=span_name, context=parent_context)
+        span = self.tracer.start_span(name=span_name, context=self._playbook_context)
 
         # -- Curated "Best Practice" Attributes --
-        span.set_attribute("host.name", host.get_name())
-        span.set_attribute("code.function", task.action)
-        span.set_attribute("code.filepath", task.get_path())
-        span.set_attribute("ansible.task.name", task.get_name())
-        span.set_attribute("ansible.task.status", status_string)
-        if 'changed' in result._result:
-            span.set_attribute("ansible.result.changed", result._result['changed'])
-
-        status_code = StatusCode.OK
+        attrs = {
+            "host.name": host_name,
+            "code.function": task.action,
+            "code.filepath": task.get_path(),
+            "ansible.task.name": task_name,
+            "ansible.task.status": status_string,
+        }
+        changed = result._result.get('changed', _MISSING)
+        if changed is not _MISSING:
+            attrs["ansible.result.changed"] = changed
+        span.set_attributes(attrs)
+
+        status = _OK_STATUS
         if status_string == "failed":
             self.errors_in_playbook += 1
-            status_code = StatusCode.ERROR
-            span.set_attribute("error", True)
+            status = _ERROR_STATUS
             msg = result._result.get('msg', 'Task failed without a specific message.')
-            span.record_exception(Exception(msg))
+            # Same event record_exception emits, minus the throwaway Exception and traceback capture
+            span.add_event("exception", {"exception.type": "Exception", "exception.message": msg})
 
-        span.set_status(Status(status_code))
+        span.set_status(status)
         span.end()
 
     def v2_runner_on_ok(self, result):
@@ -215,6 +446,7 @@ class CallbackModule(CallbackBase):
         self._create_task_result_span(result, "ignored" if ignore_errors else "failed")
 
     def v2_runner_on_skipped(self, result):
+        if not self._config.record_skipped: return
         self._create_task_result_span(result, "skipped")
 
     def v2_playbook_on_stats(self, stats):
@@ -224,9 +456,22 @@ class CallbackModule(CallbackBase):
         if self.errors_in_playbook > 0:
             self.playbook_span.set_status(Status(StatusCode.ERROR, f"{self.errors_in_playbook} tasks failed."))
         else:
-            self.playbook_span.set_status(Status(StatusCode.OK))
+            self.playbook_span.set_status(_OK_STATUS)
         self.playbook_span.end()
 
         self._debug("Forcing flush of all spans before exit.")
-        self.tracer_provider.force_flush()
-        self._debug("Flush complete.")
\ No newline at end of file
+        timeout_millis = self._config.flush_timeout_millis
+
+        def flush_and_shutdown():
+            self.tracer_provider.force_flush(timeout_millis=timeout_millis)
+            self.tracer_provider.shutdown()
+
+        # Flush and shutdown share one deadline so an unreachable collector cannot hold the playbook open;
+        # shutdown alone has no bound and runs a final export, so both run on a thread we stop waiting for.
+        closer = threading.Thread(target=flush_and_shutdown, daemon=True)
+        closer.start()
+        closer.join(timeout_millis / 1000)
+        if closer.is_alive():
+            self._display.warning(f"Span export did not finish within {timeout_millis}ms; pending spans were dropped.")
+        else:
+            self._debug("Flush complete.")
\ No newline at end of file